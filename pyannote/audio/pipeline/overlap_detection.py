@@ -128,20 +128,27 @@ class OverlapDetection(Pipeline):
         # if this check has not been done yet, do it once and for all
         if not hasattr(self, "log_scale_"):
             # heuristic to determine whether scores are log-scaled
-            if np.nanmean(ovl_scores.data) < 0:
+            # (this is a global property: looking at a few frames is enough)
+            if np.nanmean(ovl_scores.data[:1024]) < 0:
                 self.log_scale_ = True
             else:
                 self.log_scale_ = False
 
-        data = np.exp(ovl_scores.data) if self.log_scale_ else ovl_scores.data
+        data = ovl_scores.data
 
         # overlap vs. non-overlap
         if data.shape[1] > 1:
-            overlap_prob = SlidingWindowFeature(
-                1.0 - data[:, 0], ovl_scores.sliding_window
-            )
-        else:
-            overlap_prob = SlidingWindowFeature(data, ovl_scores.sliding_window)
+            # only the non-overlap column is needed: 1 - exp(.) is computed
+            # in one pass (rather than exponentiating all columns first)
+            non_overlap = data[:, 0]
+            if self.log_scale_:
+                data = -np.expm1(non_overlap)
+            else:
+                data = 1.0 - non_overlap
+        elif self.log_scale_:
+            data = np.exp(data)
+
+        overlap_prob = SlidingWindowFeature(data, ovl_scores.sliding_window)
 
         overlap = self._binarize.apply(overlap_prob)
 
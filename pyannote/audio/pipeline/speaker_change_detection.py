@@ -121,17 +121,22 @@ class SpeakerChangeDetection(Pipeline):
         # if this check has not been done yet, do it once and for all
         if not hasattr(self, "log_scale_"):
             # heuristic to determine whether scores are log-scaled
-            if np.nanmean(scd_scores.data) < 0:
+            # (this is a global property: looking at a few frames is enough)
+            if np.nanmean(scd_scores.data[:1024]) < 0:
                 self.log_scale_ = True
             else:
                 self.log_scale_ = False
 
-        data = np.exp(scd_scores.data) if self.log_scale_ else scd_scores.data
-
         # take the final dimension
         # (in order to support both classification, multi-class classification,
         # and regression scores)
-        change_prob = SlidingWindowFeature(data[:, -1], scd_scores.sliding_window)
+        data = scd_scores.data[:, -1]
+
+        # only exponentiate the final dimension
+        if self.log_scale_:
+            data = np.exp(data)
+
+        change_prob = SlidingWindowFeature(data, scd_scores.sliding_window)
 
         # peak detection
         change = self._peak.apply(change_prob)
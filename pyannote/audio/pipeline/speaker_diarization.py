@@ -42,6 +42,7 @@ from .speech_turn_segmentation import OracleSpeechTurnSegmentation
 
 from .speech_turn_clustering import SpeechTurnClustering
 from .speech_turn_assignment import SpeechTurnClosestAssignment
+from .utils import warmup_model
 
 from pyannote.pipeline import Pipeline
 from pyannote.pipeline.parameter import Uniform
@@ -84,6 +85,10 @@ class SpeakerDiarization(Pipeline):
     purity : `float`, optional
         Optimize coverage for target purity.
         Defaults to optimizing diarization error rate.
+    warmup : `bool`, optional
+        Apply GPU models once on silence when the pipeline is first
+        initialized, so that the first processed file does not pay their
+        cold-start cost. Defaults to False.
 
     Hyper-parameters
     ----------------
@@ -101,6 +106,7 @@ class SpeakerDiarization(Pipeline):
         method: Optional[str] = "pool",
         evaluation_only: Optional[bool] = False,
         purity: Optional[float] = None,
+        warmup: Optional[bool] = False,
     ):
 
         super().__init__()
@@ -122,6 +128,7 @@ class SpeakerDiarization(Pipeline):
             )
         self.evaluation_only = evaluation_only
         self.purity = purity
+        self.warmup = warmup
 
         self.min_duration = Uniform(0, 10)
 
@@ -136,6 +143,33 @@ class SpeakerDiarization(Pipeline):
             embedding=self.embedding, metric=self.metric
         )
 
+    def initialize(self):
+        """Initialize pipeline with current set of parameters"""
+
+        # cold-start cost is paid once per process: no need to warm models
+        # up again for every new set of hyper-parameters
+        if not self.warmup or getattr(self, "warmed_up_", False):
+            return
+
+        models = [
+            self.speech_turn_clustering._embedding,
+            self.speech_turn_assignment._embedding,
+        ]
+        if isinstance(self.speech_turn_segmentation, SpeechTurnSegmentation):
+            for pipeline in [
+                self.speech_turn_segmentation.speech_activity_detection,
+                self.speech_turn_segmentation.speaker_change_detection,
+            ]:
+                # oracle pipelines do not rely on any model
+                scores = getattr(pipeline, "_scores", None)
+                if scores is not None:
+                    models.append(scores)
+
+        for model in models:
+            warmup_model(model)
+
+        self.warmed_up_ = True
+
     def __call__(self, current_file: dict) -> Annotation:
         """Apply speaker diarization
 
@@ -170,10 +204,12 @@ class SpeakerDiarization(Pipeline):
         # split short/long speech turns. the idea is to first cluster long
         # speech turns (i.e. those for which we can trust embeddings) and then
         # assign each speech turn to the closest cluster.
+        # (hyper-parameter is read once rather than for every speech turn)
+        min_duration = self.min_duration
         long_speech_turns = speech_turns.empty()
         shrt_speech_turns = speech_turns.empty()
         for segment, track, label in speech_turns.itertracks(yield_label=True):
-            if segment.duration < self.min_duration:
+            if segment.duration < min_duration:
                 shrt_speech_turns[segment, track] = label
             else:
                 long_speech_turns[segment, track] = label
@@ -63,7 +63,7 @@ class OracleSpeechActivityDetection(Pipeline):
             Speech regions
         """
 
-        speech = current_file["annotation"].get_timeline().support()
+        speech = current_file["annotation"].get_timeline(copy=False).support()
         return speech.to_annotation(generator="string", modality="speech")
 
 
@@ -141,20 +141,27 @@ class SpeechActivityDetection(Pipeline):
         # if this check has not been done yet, do it once and for all
         if not hasattr(self, "log_scale_"):
             # heuristic to determine whether scores are log-scaled
-            if np.nanmean(sad_scores.data) < 0:
+            # (this is a global property: looking at a few frames is enough)
+            if np.nanmean(sad_scores.data[:1024]) < 0:
                 self.log_scale_ = True
             else:
                 self.log_scale_ = False
 
-        data = np.exp(sad_scores.data) if self.log_scale_ else sad_scores.data
+        data = sad_scores.data
 
         # speech vs. non-speech
         if data.shape[1] > 1:
-            speech_prob = SlidingWindowFeature(
-                1.0 - data[:, 0], sad_scores.sliding_window
-            )
-        else:
-            speech_prob = SlidingWindowFeature(data, sad_scores.sliding_window)
+            # only the non-speech column is needed: 1 - exp(.) is computed
+            # in one pass (rather than exponentiating all columns first)
+            non_speech = data[:, 0]
+            if self.log_scale_:
+                data = -np.expm1(non_speech)
+            else:
+                data = 1.0 - non_speech
+        elif self.log_scale_:
+            data = np.exp(data)
+
+        speech_prob = SlidingWindowFeature(data, sad_scores.sliding_window)
 
         speech = self._binarize.apply(speech_prob)
 
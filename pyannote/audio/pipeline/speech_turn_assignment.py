@@ -35,11 +35,41 @@ from pyannote.pipeline.blocks.classification import ClosestAssignment
 from pyannote.core import Annotation
 from .utils import assert_int_labels
 from .utils import assert_string_labels
+from .utils import cosine_cdist
+from .utils import gather_label_embeddings
+from .utils import get_cached_features
 from ..features import Precomputed
 
 from pyannote.audio.features.wrapper import Wrapper, Wrappable
 
 
+class _ClosestAssignment(ClosestAssignment):
+    """Closest assignment with matrix product-based cosine distance
+
+    Same as `ClosestAssignment`, except that cosine distance is computed with
+    a (much faster) matrix product rather than scipy's cdist. Other metrics
+    fall back to `ClosestAssignment`.
+    """
+
+    def __call__(self, X_target: np.ndarray, X: np.ndarray) -> np.ndarray:
+
+        if self.metric != "cosine":
+            return super().__call__(X_target, X)
+
+        # cosine distance does not depend on embeddings norm, hence
+        # there is no need to care about normalization here
+        distance = cosine_cdist(X_target, X)
+        targets = np.argmin(distance, axis=0)
+        closest = np.take_along_axis(distance, targets[np.newaxis], axis=0)[0]
+
+        # same convention as ClosestAssignment: i-th embedding is marked as
+        # unassigned with -i (hence the first one is always assigned)
+        too_far = closest > self.threshold
+        targets[too_far] = -np.arange(len(targets))[too_far]
+
+        return targets
+
+
 class SpeechTurnClosestAssignment(Pipeline):
     """Assign speech turn to closest cluster
 
@@ -64,7 +94,7 @@ class SpeechTurnClosestAssignment(Pipeline):
 
         self.metric = metric
 
-        self.closest_assignment = ClosestAssignment(metric=self.metric)
+        self.closest_assignment = _ClosestAssignment(metric=self.metric)
 
     def __call__(
         self, current_file: dict, speech_turns: Annotation, targets: Annotation
@@ -89,53 +119,18 @@ class SpeechTurnClosestAssignment(Pipeline):
         assert_string_labels(targets, "targets")
         assert_int_labels(speech_turns, "speech_turns")
 
-        embedding = self._embedding(current_file)
+        embedding = get_cached_features(
+            current_file, self._embedding, "@diarization/emb"
+        )
 
         # gather targets embedding
-        labels = targets.labels()
-        X_targets, targets_labels = [], []
-        for l, label in enumerate(labels):
-
-            timeline = targets.label_timeline(label, copy=False)
-
-            # be more and more permissive until we have
-            # at least one embedding for current speech turn
-            for mode in ["strict", "center", "loose"]:
-                x = embedding.crop(timeline, mode=mode)
-                if len(x) > 0:
-                    break
-
-            # skip labels so small we don't have any embedding for it
-            if len(x) < 1:
-                continue
-
-            targets_labels.append(label)
-            X_targets.append(np.mean(x, axis=0))
+        X_targets, targets_labels, _ = gather_label_embeddings(embedding, targets)
 
         # gather speech turns embedding
-        labels = speech_turns.labels()
-        X, assigned_labels, skipped_labels = [], [], []
-        for l, label in enumerate(labels):
-
-            timeline = speech_turns.label_timeline(label, copy=False)
-
-            # be more and more permissive until we have
-            # at least one embedding for current speech turn
-            for mode in ["strict", "center", "loose"]:
-                x = embedding.crop(timeline, mode=mode)
-                if len(x) > 0:
-                    break
-
-            # skip labels so small we don't have any embedding for it
-            if len(x) < 1:
-                skipped_labels.append(label)
-                continue
-
-            assigned_labels.append(label)
-            X.append(np.mean(x, axis=0))
+        X, assigned_labels, _ = gather_label_embeddings(embedding, speech_turns)
 
         # assign speech turns to closest class
-        assignments = self.closest_assignment(np.vstack(X_targets), np.vstack(X))
+        assignments = self.closest_assignment(X_targets, X)
         mapping = {
             label: targets_labels[k]
             for label, k in zip(assigned_labels, assignments)
@@ -28,19 +28,63 @@
 
 import numpy as np
 from typing import Optional
+from scipy.cluster.hierarchy import fcluster
+
+try:
+    import fastcluster
+except ImportError as e:
+    fastcluster = None
 
 from pyannote.core import Annotation
-from pyannote.core import Timeline
 from pyannote.core.utils.numpy import one_hot_decoding
 from pyannote.pipeline import Pipeline
 from pyannote.audio.features import Precomputed
 from pyannote.pipeline.blocks.clustering import HierarchicalAgglomerativeClustering
 from pyannote.pipeline.blocks.clustering import AffinityPropagationClustering
 from .utils import assert_string_labels
+from .utils import center_fixed_ranges
+from .utils import gather_label_embeddings
+from .utils import get_cached_features
+from .utils import ranges_to_frames
 
 from pyannote.audio.features.wrapper import Wrapper, Wrappable
 
 
+class _HierarchicalAgglomerativeClustering(HierarchicalAgglomerativeClustering):
+    """Hierarchical agglomerative clustering with `fastcluster` linkage
+
+    Standard linkage methods (i.e. all but "pool") are delegated to
+    `fastcluster` when it is installed (pip install pyannote.audio[fastcluster]).
+    Everything else (including the default "pool" method and "angular" metric)
+    falls back to `HierarchicalAgglomerativeClustering`.
+    """
+
+    def __call__(self, X: np.ndarray, *args, **kwargs) -> np.ndarray:
+
+        if (
+            fastcluster is None
+            or args
+            or kwargs
+            or not self.use_threshold
+            or getattr(self, "normalize", False)
+            or self.method == "pool"
+            or self.metric not in ["euclidean", "cosine"]
+            or len(X) < 2
+        ):
+            return super().__call__(X, *args, **kwargs)
+
+        # those methods are only defined for euclidean metric
+        if self.method in ["centroid", "median", "ward"]:
+            if self.metric != "euclidean":
+                return super().__call__(X, *args, **kwargs)
+            Z = fastcluster.linkage_vector(X, method=self.method, metric=self.metric)
+
+        else:
+            Z = fastcluster.linkage(X, method=self.method, metric=self.metric)
+
+        return fcluster(Z, self.threshold, criterion="distance")
+
+
 class SpeechTurnClustering(Pipeline):
     """Speech turn clustering
 
@@ -57,6 +101,10 @@ class SpeechTurnClustering(Pipeline):
         Set method used for clustering. "pool" stands for agglomerative
         hierarchical clustering with embedding pooling. "affinity_propagation"
         is for clustering based on affinity propagation. Defaults to "pool".
+        Any other value (e.g. "average") is used as linkage method for
+        agglomerative hierarchical clustering. Only those non-"pool" linkage
+        methods rely on the optional `fastcluster` dependency (when it is
+        installed) for faster linkage.
     window_wise : `bool`, optional
         Set `window_wise` to True to apply clustering on embedding extracted
         using the built-in sliding window. Defaults to apply clustering at
@@ -95,21 +143,31 @@ class SpeechTurnClustering(Pipeline):
             # exemplars
 
         else:
-            self.clustering = HierarchicalAgglomerativeClustering(
+            self.clustering = _HierarchicalAgglomerativeClustering(
                 method=self.method, metric=self.metric, use_threshold=True
             )
 
         self.window_wise = window_wise
 
-    def _window_level(self, current_file: dict, speech_regions: Timeline) -> Annotation:
+    def initialize(self):
+        """Initialize pipeline with current set of parameters"""
+
+        # choose clustering level once and for all
+        # rather than checking `window_wise` for every file
+        if self.window_wise:
+            self._cluster = self._window_level
+        else:
+            self._cluster = self._turn_level
+
+    def _window_level(self, current_file: dict, speech_turns: Annotation) -> Annotation:
         """Apply clustering at window level
 
         Parameters
         ----------
         current_file : `dict`
             File as provided by a pyannote.database protocol.
-        speech_regions : `Timeline`
-            Speech regions.
+        speech_turns : `Annotation`
+            Speech turns. Only their support (i.e. speech regions) is used.
 
         Returns
         -------
@@ -117,44 +175,35 @@ class SpeechTurnClustering(Pipeline):
             Clustering result.
         """
 
+        speech_regions = speech_turns.get_timeline(copy=False).support()
+
         # load embeddings
-        embedding = self._embedding(current_file)
+        embedding = get_cached_features(
+            current_file, self._embedding, "@diarization/emb"
+        )
         window = embedding.sliding_window
 
-        # extract and stack embeddings of speech regions
-        X = np.vstack(
-            [
-                embedding.crop(segment, mode="center", fixed=segment.duration)
-                for segment in speech_regions
-            ]
+        # get indices of frames of each speech region
+        frames = ranges_to_frames(center_fixed_ranges(window, speech_regions))
+
+        # gather embeddings of speech regions directly into one array.
+        # frames cropped out of the file are only there because of padding:
+        # like SlidingWindowFeature.crop, use first (or last) frame instead.
+        n_frames = len(embedding)
+        X = embedding.data[np.clip(frames, 0, n_frames - 1)].astype(
+            np.float32, copy=False
         )
 
         # apply clustering
         y_pred = self.clustering(X)
 
-        # reconstruct
-        y = np.zeros(len(embedding), dtype=np.int8)
-
-        # n = total number of "speech" embeddings
-        # s_pred = current position in y_pred
-        s_pred, n = 0, len(y_pred)
-
-        for segment in speech_regions:
-
-            # get indices of current speech segment
-            ((s, e),) = window.crop(
-                segment, mode="center", fixed=segment.duration, return_ranges=True
-            )
-
-            # hack for the very last segment that might overflow by 1
-            e_pred = min(s_pred + e - s, n - 1)
-            e = s + (e_pred - s_pred)
-
-            # assign y_pred to the corresponding speech regions
-            y[s:e] = y_pred[s_pred:e_pred]
-
-            # increment current position in y_red
-            s_pred += e - s
+        # assign clusters to the corresponding frames at once. like the
+        # previous in-order writes, frames shared by neighbouring speech
+        # regions end up with only one cluster (NumPy keeps the last write).
+        # int64 prevents overflowing with more than 127 clusters.
+        within = (frames >= 0) & (frames < n_frames)
+        y = np.zeros(n_frames, dtype=np.int64)
+        y[frames[within]] = y_pred[within]
 
         # reconstruct hypothesis
         return one_hot_decoding(y, window)
@@ -177,31 +226,16 @@ class SpeechTurnClustering(Pipeline):
 
         assert_string_labels(speech_turns, "speech_turns")
 
-        embedding = self._embedding(current_file)
-
-        labels = speech_turns.labels()
-        X, clustered_labels, skipped_labels = [], [], []
-        for l, label in enumerate(labels):
-
-            timeline = speech_turns.label_timeline(label, copy=False)
-
-            # be more and more permissive until we have
-            # at least one embedding for current speech turn
-            for mode in ["strict", "center", "loose"]:
-                x = embedding.crop(timeline, mode=mode)
-                if len(x) > 0:
-                    break
-
-            # skip labels so small we don't have any embedding for it
-            if len(x) < 1:
-                skipped_labels.append(label)
-                continue
+        embedding = get_cached_features(
+            current_file, self._embedding, "@diarization/emb"
+        )
 
-            clustered_labels.append(label)
-            X.append(np.mean(x, axis=0))
+        X, clustered_labels, skipped_labels = gather_label_embeddings(
+            embedding, speech_turns
+        )
 
         # apply clustering of label embeddings
-        clusters = self.clustering(np.vstack(X))
+        clusters = self.clustering(X)
 
         # map each clustered label to its cluster (between 1 and N_CLUSTERS)
         mapping = {label: k for label, k in zip(clustered_labels, clusters)}
@@ -236,9 +270,4 @@ class SpeechTurnClustering(Pipeline):
         if speech_turns is None:
             speech_turns = current_file["speech_turns"]
 
-        if self.window_wise:
-            return self._window_level(
-                current_file, speech_turns.get_timeline().support()
-            )
-
-        return self._turn_level(current_file, speech_turns)
+        return self._cluster(current_file, speech_turns)
@@ -120,7 +120,8 @@ class SpeechTurnSegmentation(Pipeline):
         """
 
         # speech regions
-        sad = self.speech_activity_detection(current_file).get_timeline()
+        # (no need to copy the timeline of this temporary annotation)
+        sad = self.speech_activity_detection(current_file).get_timeline(copy=False)
 
         scd = self.speaker_change_detection(current_file)
         speech_turns = scd.crop(sad, mode="intersection")
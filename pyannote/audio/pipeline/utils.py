@@ -28,10 +28,21 @@
 
 
 import yaml
+import numpy as np
 from pathlib import Path
+from typing import List
+from typing import Text
+from typing import Tuple
 from pyannote.core import Annotation
+from pyannote.core import SlidingWindow
+from pyannote.core import SlidingWindowFeature
+from pyannote.core import Timeline
 from pyannote.pipeline import Pipeline
 from pyannote.core.utils.helper import get_class_by_name
+from pyannote.audio.features import FeatureExtraction
+from pyannote.audio.features import Precomputed
+from pyannote.audio.features import Pretrained
+from pyannote.audio.features.wrapper import Wrapper
 
 
 def assert_string_labels(annotation: Annotation, name: str):
@@ -64,6 +75,284 @@ def assert_int_labels(annotation: Annotation, name: str):
         raise ValueError(msg)
 
 
+def get_cached_features(
+    current_file: dict, features: Wrapper, key: Text
+) -> SlidingWindowFeature:
+    """Extract features from the whole file, reusing cached ones if possible
+
+    Parameters
+    ----------
+    current_file : `dict`
+        File as provided by a pyannote.database protocol.
+    features : `Wrapper`
+        Feature extraction.
+    key : `Text`
+        Key of `current_file` where extracted features are cached.
+
+    Returns
+    -------
+    features : `pyannote.core.SlidingWindowFeature`
+        Extracted features.
+
+    Notes
+    -----
+    Only features extracted by `Pretrained` models (without data augmentation)
+    or loaded by `Precomputed` are cached, and they are only reused when they
+    were extracted with the same weights, chunk duration and step (or loaded
+    from the same directory). Any other feature extraction (e.g. MFCC) may be
+    configured in ways that the cache cannot tell apart, so it is applied
+    every time.
+    """
+
+    scorer = features.scorer_
+
+    if isinstance(scorer, Pretrained):
+        # data augmentation makes extraction non-deterministic
+        if scorer.augmentation is not None:
+            return features(current_file)
+        signature = (
+            "Pretrained",
+            str(scorer.weights_pt_),
+            scorer.duration,
+            scorer.step,
+        )
+
+    elif isinstance(scorer, Precomputed):
+        signature = ("Precomputed", str(scorer.root_dir))
+
+    # e.g. features provided by the protocol ("@emb") or any other extraction
+    else:
+        return features(current_file)
+
+    if key in current_file:
+        cached_signature, cached_features = current_file[key]
+        if cached_signature == signature:
+            return cached_features
+
+    extracted_features = features(current_file)
+    current_file[key] = (signature, extracted_features)
+    return extracted_features
+
+
+def warmup_model(features: Wrapper, duration: float = 1.0):
+    """Apply model once on silence to pay its cold-start cost upfront
+
+    First inference on GPU is much slower than the next ones (e.g. because
+    of cuDNN auto-tuning). This does nothing unless `features` relies on a
+    model running on GPU.
+
+    Parameters
+    ----------
+    features : `Wrapper`
+        Feature extraction.
+    duration : `float`, optional
+        Duration of silence. Defaults to 1s (or the duration of the chunks
+        processed by the model, if longer).
+    """
+
+    if not isinstance(features.scorer_, FeatureExtraction):
+        return
+
+    device = getattr(features, "device", None)
+    if device is None or device.type == "cpu":
+        return
+
+    duration = max(duration, getattr(features, "duration", None) or 0.0)
+    sample_rate = features.sample_rate
+    n_samples = int(duration * sample_rate)
+
+    features(
+        {
+            "uri": "warmup",
+            "waveform": np.zeros((n_samples, 1), dtype=np.float32),
+            "duration": n_samples / sample_rate,
+        }
+    )
+
+
+def cosine_cdist(X: np.ndarray, Y: np.ndarray, eps: float = 1e-8) -> np.ndarray:
+    """Compute cosine distance between each pair of the two collections
+
+    Same as `scipy.spatial.distance.cdist(X, Y, metric="cosine")` but relies
+    on a (BLAS-backed) matrix product of L2-normalized embeddings.
+
+    Parameters
+    ----------
+    X : (m, dimension) `np.ndarray`
+    Y : (n, dimension) `np.ndarray`
+    eps : `float`, optional
+        Prevents division by zero for null vectors. Defaults to 1e-8.
+
+    Returns
+    -------
+    distance : (m, n) `np.ndarray`
+        Cosine distance matrix.
+    """
+
+    X = X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), eps)
+    Y = Y / np.maximum(np.linalg.norm(Y, axis=1, keepdims=True), eps)
+    return 1.0 - X @ Y.T
+
+
+def ranges_to_frames(ranges: List[Tuple[int, int]]) -> np.ndarray:
+    """Expand (start, end) ranges into the indices of the frames they contain
+
+    Same as np.concatenate([np.arange(start, end) for start, end in ranges])
+    without the intermediate per-range arrays.
+
+    Parameters
+    ----------
+    ranges : list of (start, end) tuples
+        Ranges of frames, as returned by `SlidingWindow.crop(...,
+        return_ranges=True)`. Empty ranges (end <= start) are skipped.
+
+    Returns
+    -------
+    frames : `np.ndarray`
+        Indices of frames.
+    """
+
+    ranges = np.array(ranges, dtype=np.int64).reshape(-1, 2)
+    starts = ranges[:, 0]
+    lengths = np.maximum(ranges[:, 1] - starts, 0)
+
+    # position of each frame within its own range
+    positions = np.arange(np.sum(lengths)) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    return np.repeat(starts, lengths) + positions
+
+
+def center_fixed_ranges(
+    sliding_window: SlidingWindow, timeline: Timeline
+) -> np.ndarray:
+    """Get frame ranges of every segment of a timeline, all at once
+
+    Same as stacking sliding_window.crop(segment, mode="center",
+    fixed=segment.duration, return_ranges=True) for each segment, without
+    going through the per-segment Python arithmetic.
+
+    Parameters
+    ----------
+    sliding_window : `pyannote.core.SlidingWindow`
+        Sliding window.
+    timeline : `pyannote.core.Timeline`
+        Timeline.
+
+    Returns
+    -------
+    ranges : (n_segments, 2) `np.ndarray`
+        (start, end) frame range of each segment. Might be out of bounds.
+    """
+
+    boundaries = np.array(
+        [[segment.start, segment.duration] for segment in timeline], dtype=np.float64
+    ).reshape(-1, 2)
+
+    # index of the frame whose center is the closest to each segment start
+    # (see SlidingWindow.closest_frame)
+    starts = np.rint(
+        (boundaries[:, 0] - sliding_window.start - 0.5 * sliding_window.duration)
+        / sliding_window.step
+    ).astype(np.int64)
+
+    # number of frames for each segment duration
+    # (see SlidingWindow.samples with "center" mode)
+    n_frames = np.rint(boundaries[:, 1] / sliding_window.step).astype(np.int64)
+
+    return np.stack([starts, starts + n_frames], axis=1)
+
+
+def _crop_frames(
+    sliding_window: SlidingWindow, timeline: Timeline, mode: Text, n_frames: int
+) -> np.ndarray:
+    """Get indices of frames that SlidingWindowFeature.crop would return
+
+    Parameters
+    ----------
+    sliding_window : `pyannote.core.SlidingWindow`
+        Sliding window.
+    timeline : `pyannote.core.Timeline`
+        Region to crop.
+    mode : {'loose', 'strict', 'center'}
+        See `pyannote.core.SlidingWindow.crop`.
+    n_frames : `int`
+        Total number of frames.
+
+    Returns
+    -------
+    frames : `np.ndarray`
+        Indices of cropped frames.
+    """
+
+    ranges = sliding_window.crop(timeline, mode=mode, return_ranges=True)
+    return ranges_to_frames(np.clip(np.array(ranges).reshape(-1, 2), 0, n_frames))
+
+
+def gather_label_embeddings(
+    embedding: SlidingWindowFeature, annotation: Annotation
+) -> Tuple[np.ndarray, List, List]:
+    """Compute one average embedding per label
+
+    Parameters
+    ----------
+    embedding : `pyannote.core.SlidingWindowFeature`
+        Embeddings extracted from the whole file.
+    annotation : `pyannote.core.Annotation`
+        Annotation.
+
+    Returns
+    -------
+    X : (n_embedded_labels, dimension) `np.ndarray`
+        Average (float32) embedding of each embedded label.
+    embedded_labels : `list`
+        Labels embedded in X (in the same order).
+    skipped_labels : `list`
+        Labels so short that no embedding could be found for them.
+    """
+
+    data = embedding.data
+    n_frames = len(data)
+    window = embedding.sliding_window
+
+    frames, offsets, embedded_labels, skipped_labels = [], [], [], []
+    n_gathered = 0
+    for label in annotation.labels():
+
+        timeline = annotation.label_timeline(label, copy=False)
+
+        # be more and more permissive until we have
+        # at least one embedding for current label
+        for mode in ["strict", "center", "loose"]:
+            label_frames = _crop_frames(window, timeline, mode, n_frames)
+            if len(label_frames) > 0:
+                break
+
+        # skip labels so small we don't have any embedding for it
+        if len(label_frames) < 1:
+            skipped_labels.append(label)
+            continue
+
+        embedded_labels.append(label)
+        frames.append(label_frames)
+        offsets.append(n_gathered)
+        n_gathered += len(label_frames)
+
+    if not embedded_labels:
+        X = np.empty((0, data.shape[1]), dtype=np.float32)
+        return X, embedded_labels, skipped_labels
+
+    # frames of a given label are contiguous in the gathered array, hence
+    # per-label means boil down to one segment-sum of the gathered frames
+    # (embeddings are kept as float32 to halve memory traffic downstream)
+    X = np.add.reduceat(
+        data[np.concatenate(frames)].astype(np.float32, copy=False), offsets, axis=0
+    )
+    X /= np.diff(offsets + [n_gathered])[:, np.newaxis]
+
+    return X, embedded_labels, skipped_labels
+
+
 def load_pretrained_pipeline(train_dir: Path) -> Pipeline:
     """Load pretrained pipeline
 
@@ -43,6 +43,9 @@ setup(
     namespace_packages=['pyannote'],
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={
+        'fastcluster': ['fastcluster >= 1.1.25'],
+    },
     entry_points = {
         'console_scripts': [
             'pyannote-audio=pyannote.audio.applications.pyannote_audio:main',
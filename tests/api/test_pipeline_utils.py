@@ -0,0 +1,87 @@
+import numpy as np
+
+from pyannote.core import Annotation
+from pyannote.core import Segment
+from pyannote.core import SlidingWindow
+from pyannote.core import SlidingWindowFeature
+from pyannote.core import Timeline
+
+from pyannote.audio.pipeline.utils import center_fixed_ranges
+from pyannote.audio.pipeline.utils import gather_label_embeddings
+from pyannote.audio.pipeline.utils import ranges_to_frames
+
+
+def random_timeline(rng, n_segments=20, total_duration=60.0):
+    starts = np.sort(rng.uniform(0.0, total_duration, size=n_segments))
+    durations = rng.uniform(0.01, 3.0, size=n_segments)
+    return Timeline(
+        segments=[Segment(s, s + d) for s, d in zip(starts, durations)]
+    ).support()
+
+
+def test_center_fixed_ranges():
+    rng = np.random.RandomState(0)
+    for _ in range(100):
+        window = SlidingWindow(
+            start=rng.uniform(-1.0, 1.0),
+            duration=rng.uniform(0.01, 3.0),
+            step=rng.uniform(0.01, 0.5),
+        )
+        timeline = random_timeline(rng)
+        expected = [
+            window.crop(
+                segment, mode="center", fixed=segment.duration, return_ranges=True
+            )[0]
+            for segment in timeline
+        ]
+        np.testing.assert_array_equal(
+            center_fixed_ranges(window, timeline), np.array(expected)
+        )
+
+
+def test_ranges_to_frames():
+    rng = np.random.RandomState(0)
+    for _ in range(100):
+        starts = rng.randint(-10, 100, size=10)
+        ranges = [(s, s + l) for s, l in zip(starts, rng.randint(-5, 20, size=10))]
+        expected = np.concatenate(
+            [np.arange(start, end) for start, end in ranges]
+        ).astype(np.int64)
+        np.testing.assert_array_equal(ranges_to_frames(ranges), expected)
+
+    assert len(ranges_to_frames([])) == 0
+
+
+def test_gather_label_embeddings():
+    rng = np.random.RandomState(0)
+    window = SlidingWindow(start=0.0, duration=2.0, step=0.5)
+    embedding = SlidingWindowFeature(
+        rng.randn(120, 16).astype(np.float32), window
+    )
+
+    for _ in range(20):
+        annotation = Annotation()
+        for i, segment in enumerate(random_timeline(rng)):
+            annotation[segment] = f"speaker{i % 4}"
+
+        X, embedded_labels, skipped_labels = gather_label_embeddings(
+            embedding, annotation
+        )
+
+        # reference implementation relying on SlidingWindowFeature.crop
+        expected_X, expected_embedded, expected_skipped = [], [], []
+        for label in annotation.labels():
+            timeline = annotation.label_timeline(label, copy=False)
+            for mode in ["strict", "center", "loose"]:
+                x = embedding.crop(timeline, mode=mode)
+                if len(x) > 0:
+                    break
+            if len(x) < 1:
+                expected_skipped.append(label)
+                continue
+            expected_embedded.append(label)
+            expected_X.append(np.mean(x, axis=0))
+
+        assert embedded_labels == expected_embedded
+        assert skipped_labels == expected_skipped
+        np.testing.assert_allclose(X, np.vstack(expected_X), rtol=1e-5, atol=1e-6)